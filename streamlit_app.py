@@ -1,13 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import os
+import json
 import sys
+import threading
+from types import SimpleNamespace
 
 # Set page configuration
 st.set_page_config(
@@ -30,7 +28,10 @@ APP_COLORS = {
 }
 
 # Custom CSS for professional styling
-st.markdown(f"""
+@st.cache_resource
+def build_app_css():
+    """Format the stylesheet once per server process"""
+    return f"""
 <style>
     .main-header {{
         font-size: 2.5rem; 
@@ -128,79 +129,714 @@ st.markdown(f"""
         border-top: 1px solid {APP_COLORS['light_gray']};
     }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit removes elements a rerun does not emit, so the cached stylesheet is still written each run
+st.markdown(build_app_css(), unsafe_allow_html=True)
 
 # Add project root to path for imports
 sys.path.append('.')
 
-# Data loading functions with error handling
-@st.cache_data
-def load_data_safely():
-    """Load data with graceful error handling"""
-    data = {}
+# Cleaned transactions - too large to hold in memory, so it is streamed by summarize_transactions
+TRANSACTIONS_FILE = 'data_clean/transactions.csv'
+
+# Rows per chunk when streaming the transactions file
+CHUNK_ROWS = 200_000
+
+# Data files produced by the notebooks, keyed by their name in the app
+FILES = {
+    'baseline': 'outputs/sku_baseline.csv',
+    'rules': 'outputs/assoc_rules_pairs.csv',
+    'promo': 'outputs/promo_scenarios_summary.csv',
+}
+
+# Explicit read options so pandas skips type inference on the large files
+READ_OPTIONS = {
+    'transactions': {
+        # Every column is kept: the Cleaned Data preview, missing-value and dtype charts cover the whole table
+        'dtype': {'StockCode': 'category', 'Customer ID': 'category', 'Quantity': 'int32', 'Price': 'float32'},
+        'parse_dates': ['InvoiceDate'],
+    },
+    'rules': {
+        'dtype': {'antecedent': 'category', 'consequent': 'category'},
+    },
+    'promo': {
+        # The anchor names repeat across every discount level, so they are stored once as categories
+        'dtype': {'anchor_description': 'category'},
+    },
+}
+
+# Scenario Explorer table: the columns shown and the most rows sent to the browser (the rest is downloadable)
+PROMO_DISPLAY_COLUMNS = ['anchor_description', 'discount_pct', 'total_revenue_impact', 'total_margin_impact', 'cross_sell_items']
+PROMO_TABLE_ROWS = 500
+
+# Columns the pages rank by; sorting once at load lets them take head() instead of nlargest()
+SORT_COLUMNS = {
+    'baseline': 'revenue',
+    'rules': 'lift',
+}
+
+# Rows kept as ready-made previews, so pages don't slice the full frames on every rerun
+PREVIEW_ROWS = {
+    'transactions': 100,
+    'baseline': 50,
+    'rules': 50,
+}
+
+# In-memory cache entries kept per dataset or chart: only the current data_version is read again, plus one
+# spare so a file change doesn't evict entries still being served. The counts multiplying it are the call sites.
+# The two disk-persisted loaders keep no spare on disk; prune_disk_caches clears them when the data changes.
+CACHE_VERSIONS = 2
+
+# Last data_version the disk-persisted loaders were filled for, kept beside Streamlit's disk cache so it survives restarts
+DATA_VERSION_MARKER = os.path.join(os.path.expanduser('~'), '.streamlit', 'cache', 'market_basket_data_version.json')
+
+def scan_data_files():
+    """Return (path, mtime) pairs for the data files present, from one scandir per folder"""
+    paths = [TRANSACTIONS_FILE, *FILES.values()]
+    watched = {candidate for path in paths for candidate in (path, os.path.splitext(path)[0] + '.parquet')}
     
-    # Try to load cleaned data
+    found = []
+    for directory in sorted({os.path.dirname(path) for path in paths}):
+        try:
+            with os.scandir(directory) as entries:
+                found.extend((entry.path, entry.stat().st_mtime) for entry in entries if entry.path in watched)
+        except OSError:
+            continue
+    return tuple(sorted(found))
+
+def parquet_copy(path, present):
+    """Path of the Parquet copy of a data file, if there is one no older than the CSV"""
+    # A failed or skipped notebook write can leave an old copy behind, so it must not shadow a newer CSV
+    parquet_path = os.path.splitext(path)[0] + '.parquet'
+    if parquet_path in present and present[parquet_path] >= present.get(path, 0):
+        return parquet_path
+    return None
+
+def read_data_file(path, present, options):
+    """Read a data file, preferring a Parquet copy when the notebooks wrote one"""
+    parquet_path = parquet_copy(path, present)
+    if parquet_path is not None:
+        df = pd.read_parquet(parquet_path, columns=options.get('usecols'))
+        return df.astype(options.get('dtype', {}))
+    if path in present:
+        return pd.read_csv(path, engine='pyarrow', **options)
+    return None
+
+def iter_data_file_chunks(path, present, options):
+    """Yield a data file in chunks, preferring a Parquet copy when the notebooks wrote one"""
+    parquet_path = parquet_copy(path, present)
+    if parquet_path is not None:
+        import pyarrow.parquet as pq
+        
+        parquet_file = pq.ParquetFile(parquet_path)
+        for batch in parquet_file.iter_batches(batch_size=CHUNK_ROWS, columns=options.get('usecols')):
+            yield batch.to_pandas().astype(options.get('dtype', {}))
+    elif path in present:
+        # The pyarrow engine cannot stream, so chunks are parsed with the C engine
+        yield from pd.read_csv(path, chunksize=CHUNK_ROWS, **options)
+
+def count_days(days, weights=None):
+    """Day numbers (days since epoch) that occur in days, and how often"""
+    # Count on integer day numbers rather than grouping by Python date objects
+    first_day = days.min()
+    counts = np.bincount(days - first_day, weights=weights).astype(np.int64)
+    active = np.flatnonzero(counts)
+    return active + first_day, counts[active]
+
+# Data loading functions with error handling
+def read_dataset_safely(key, path, present):
+    """Read one dataset, returning None if it is missing or unreadable"""
     try:
-        if os.path.exists('data_clean/transactions.csv'):
-            data['transactions'] = pd.read_csv('data_clean/transactions.csv')
-        else:
-            data['transactions'] = None
+        df = read_data_file(path, present, READ_OPTIONS.get(key, {}))
     except Exception as e:
-        data['transactions'] = None
+        return None
     
-    try:
-        if os.path.exists('data_clean/products.csv'):
-            data['products'] = pd.read_csv('data_clean/products.csv')
-        else:
-            data['products'] = None
-    except Exception as e:
-        data['products'] = None
+    sort_column = SORT_COLUMNS.get(key)
+    if df is not None and sort_column in df.columns:
+        df = df.sort_values(sort_column, ascending=False, kind='stable', ignore_index=True)
+    return df
+
+@st.cache_data(persist='disk', max_entries=3 * CACHE_VERSIONS)
+def load_data_safely(data_version, keys):
+    """Load the requested datasets with graceful error handling"""
+    # data_version is the (path, mtime) listing, so the cache is reused until a file changes
+    present = dict(data_version)
     
-    try:
-        if os.path.exists('data_clean/customers.csv'):
-            data['customers'] = pd.read_csv('data_clean/customers.csv')
-        else:
-            data['customers'] = None
-    except Exception as e:
-        data['customers'] = None
+    data = {key: read_dataset_safely(key, FILES[key], present) for key in keys}
+    
+    for key in keys:
+        if key in PREVIEW_ROWS:
+            data[f'{key}_preview'] = data[key].head(PREVIEW_ROWS[key]).copy() if data[key] is not None else None
+    
+    return data
+
+# Derived-data helpers are keyed by dataset name and data_version instead of hashing the frames
+@st.cache_resource(max_entries=3 * CACHE_VERSIONS)
+def column_arrays(name, version, _df, columns):
+    """Return NumPy views of the columns used by the explorer filters"""
+    return {col: _df[col].to_numpy() for col in columns}
+
+@st.cache_data(max_entries=CACHE_VERSIONS)
+def rules_summary(name, version, _rules):
+    """Average rule metrics and the top 20 rules by lift"""
+    return SimpleNamespace(
+        avg_support=_rules['support'].mean(),
+        avg_confidence=_rules['confidence'].mean(),
+        avg_lift=_rules['lift'].mean(),
+        top20=_rules.head(20),
+    )
+
+# Shared by reference (cache_resource) rather than unpickled per rerun; the page only reads it
+@st.cache_resource(max_entries=CACHE_VERSIONS)
+def promo_plot_data(name, version, _promo):
+    """Promo scenarios with numeric impact columns and no missing plot values"""
+    # Only the coerced columns are replaced; assign shares the rest instead of copying the whole frame
+    numeric = {}
+    for col in ['discount_pct', 'total_revenue_impact', 'total_margin_impact', 'cross_sell_items', 'cross_sell_revenue_impact']:
+        if col in _promo.columns:
+            numeric[col] = pd.to_numeric(_promo[col], errors='coerce')
+    
+    # Remove any rows with NaN values for plotting
+    return _promo.assign(**numeric).dropna(subset=['total_revenue_impact', 'discount_pct'])
+
+def numeric_promo_column(promo, promo_cols, col):
+    """Whether the promo table has a numeric column to average"""
+    return col in promo_cols and pd.api.types.is_numeric_dtype(promo[col])
+
+@st.cache_data(max_entries=CACHE_VERSIONS)
+def promo_discount_summary(name, version, _promo):
+    """Average scenario impact for each discount level"""
+    return _promo.groupby('discount_pct').agg({
+        'total_revenue_impact': 'mean',
+        'total_margin_impact': 'mean',
+        'cross_sell_items': 'mean'
+    }).round(2)
+
+@st.cache_data(max_entries=CACHE_VERSIONS)
+def promo_top_scenarios(name, version, _promo):
+    """Top 5 scenarios by revenue impact"""
+    values = _promo['total_revenue_impact'].to_numpy(dtype='float64')
+    missing = np.isnan(values)
+    candidates = np.flatnonzero(~missing)
+    n = min(5, len(candidates))
+    
+    # Partition out the 5th largest value instead of sorting the column; ties at it keep file order like nlargest
+    if n:
+        kth = values[candidates][np.argpartition(values[candidates], -n)[-n]]
+        above = candidates[values[candidates] > kth]
+        top = np.concatenate([above, candidates[values[candidates] == kth][:n - len(above)]])
+        top = np.sort(top)
+        top = top[np.argsort(-values[top], kind='stable')]
+    else:
+        top = candidates
+    # Like nlargest, short tables are padded with the rows missing a value
+    top = np.concatenate([top, np.flatnonzero(missing)[:5 - n]])
+    return _promo.iloc[top][['anchor_description', 'discount_pct', 'total_revenue_impact', 'total_margin_impact']]
+
+@st.cache_data(max_entries=CACHE_VERSIONS)
+def promo_box_stats(name, version, _plot_data):
+    """Min, quartiles and max of revenue impact for each discount level"""
+    discounts = _plot_data['discount_pct'].to_numpy()
+    revenue = _plot_data['total_revenue_impact'].to_numpy()
+    
+    # One sort groups the rows by discount, then each group is a contiguous slice
+    order = np.argsort(discounts, kind='stable')
+    levels, starts = np.unique(discounts[order], return_index=True)
+    groups = np.split(revenue[order], starts[1:])
+    return {level: np.percentile(group, [0, 25, 50, 75, 100]) for level, group in zip(levels.tolist(), groups)}
+
+@st.cache_data(max_entries=CACHE_VERSIONS)
+def promo_filter_bounds(name, version, _plot_data):
+    """Discount options and slider ranges for the Scenario Explorer"""
+    def column_range(col):
+        if col not in _plot_data.columns:
+            return None
+        return float(_plot_data[col].min()), float(_plot_data[col].max())
+    
+    return SimpleNamespace(
+        discount_options=sorted(_plot_data['discount_pct'].dropna().unique().tolist()),
+        revenue_range=column_range('total_revenue_impact'),
+        cross_sell_range=column_range('cross_sell_items'),
+    )
+
+@st.cache_data(persist='disk', max_entries=CACHE_VERSIONS)
+def summarize_transactions(data_version):
+    """Stream the transactions file once and collect what the Cleaned Data page shows"""
+    present = dict(data_version)
+    
+    rows = 0
+    products, customers = set(), set()
+    preview = missing = dtype_counts = None
+    day_parts, count_parts = [], []
     
-    # Try to load outputs
     try:
-        if os.path.exists('outputs/sku_baseline.csv'):
-            data['baseline'] = pd.read_csv('outputs/sku_baseline.csv')
-        else:
-            data['baseline'] = None
+        for chunk in iter_data_file_chunks(TRANSACTIONS_FILE, present, READ_OPTIONS['transactions']):
+            if preview is None:
+                preview = chunk.head(PREVIEW_ROWS['transactions']).reset_index(drop=True)
+                dtype_counts = chunk.dtypes.value_counts()
+            
+            rows += len(chunk)
+            # Categorical columns already hold each chunk's distinct values, so no hashing pass is needed
+            products.update(chunk['StockCode'].cat.categories)
+            customers.update(chunk['Customer ID'].cat.categories)
+            
+            # Per-column null counts as a plain array, so chunks add without index alignment
+            chunk_missing = np.count_nonzero(chunk.isna().to_numpy(), axis=0)
+            missing = chunk_missing if missing is None else missing + chunk_missing
+            
+            days = chunk['InvoiceDate'].dropna().to_numpy().astype('datetime64[D]').view(np.int64)
+            if len(days) > 0:
+                chunk_days, chunk_counts = count_days(days)
+                day_parts.append(chunk_days)
+                count_parts.append(chunk_counts)
     except Exception as e:
-        data['baseline'] = None
+        return None
     
-    try:
-        if os.path.exists('outputs/assoc_rules_pairs.csv'):
-            data['rules'] = pd.read_csv('outputs/assoc_rules_pairs.csv')
+    if preview is None:
+        return None
+    
+    if day_parts:
+        day_numbers, day_counts = count_days(np.concatenate(day_parts), weights=np.concatenate(count_parts))
+        first_date, last_date = (day_numbers[[0, -1]].astype('datetime64[D]')).tolist()
+    else:
+        day_numbers, day_counts = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        first_date = last_date = None
+    
+    return SimpleNamespace(
+        rows=rows,
+        unique_products=len(products),
+        unique_customers=len(customers),
+        first_date=first_date,
+        last_date=last_date,
+        preview=preview,
+        missing=pd.Series(missing, index=preview.columns),
+        dtype_counts=dtype_counts,
+        day_numbers=day_numbers,
+        day_counts=day_counts,
+    )
+
+@st.cache_resource
+def disk_cache_state():
+    """Process-wide record of the data_version checked against the marker file"""
+    return SimpleNamespace(version=None, lock=threading.Lock())
+
+def prune_disk_caches(data_version):
+    """Drop persisted results for older data versions once the data files change"""
+    # max_entries only evicts from memory; the pickles under .streamlit/cache stay until cleared
+    state = disk_cache_state()
+    with state.lock:
+        if state.version == data_version:
+            return
+        
+        current = json.dumps(data_version)
+        try:
+            with open(DATA_VERSION_MARKER) as f:
+                previous = f.read()
+        except OSError:
+            previous = None
+        
+        # A missing marker means the persisted entries can't be dated, so they are cleared too
+        if previous != current:
+            load_data_safely.clear()
+            summarize_transactions.clear()
+            try:
+                os.makedirs(os.path.dirname(DATA_VERSION_MARKER), exist_ok=True)
+                with open(DATA_VERSION_MARKER, 'w') as f:
+                    f.write(current)
+            except OSError:
+                pass
+        state.version = data_version
+
+# Most points a line or scatter chart sends to the browser
+MAX_LINE_POINTS = 1000
+MAX_SCATTER_POINTS = 2000
+
+def lttb_indices(x, y, n_out):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+# Figure builders - cached by reference so reruns reuse the same Plotly objects.
+# Plotly is imported where it is used so pages without charts never load it.
+@st.cache_resource(max_entries=2 * CACHE_VERSIONS)
+def build_top_bar_fig(name, version, _top, x, y, title, color_scale, xaxis_title, yaxis_title):
+    """Horizontal bar chart of the top rows of a dataset"""
+    import plotly.express as px
+    
+    fig = px.bar(
+        _top,
+        x=x,
+        y=y,
+        orientation='h',
+        title=title,
+        color=x,
+        color_continuous_scale=color_scale
+    )
+    fig.update_layout(xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
+
+@st.cache_resource(max_entries=4 * CACHE_VERSIONS)
+def build_histogram_fig(name, version, _df, column, title, color, xaxis_title):
+    """Histogram of a single dataset column, binned server-side"""
+    import plotly.graph_objects as go
+    
+    # Bin with NumPy so only the 30 bar heights are sent to the browser, not the raw column
+    counts, edges = np.histogram(_df[column].dropna().to_numpy(), bins=30)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color
+    ))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title="Count", bargap=0)
+    return fig
+
+@st.cache_resource(max_entries=CACHE_VERSIONS)
+def build_rules_scatter_fig(name, version, _rules):
+    """Support vs confidence scatter of the association rules"""
+    import plotly.express as px
+    
+    fig = px.scatter(
+        _rules,
+        x='support',
+        y='confidence',
+        size='lift',
+        color='lift',
+        hover_data=['antecedent', 'consequent'],
+        title="Support vs Confidence (Size = Lift)",
+        color_continuous_scale="Viridis",
+        render_mode='webgl'
+    )
+    fig.update_layout(xaxis_title="Support", yaxis_title="Confidence")
+    return fig
+
+@st.cache_resource(max_entries=CACHE_VERSIONS)
+def build_promo_box_fig(name, version, _plot_data):
+    """Box plot of revenue impact for each discount level"""
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    
+    # Quartiles per discount level are computed server-side, so the browser gets five numbers per box instead of every row
+    stats = promo_box_stats(name, version, _plot_data)
+    colors = qualitative.Set3
+    
+    fig = go.Figure([
+        go.Box(
+            x=[discount],
+            lowerfence=[low],
+            q1=[q1],
+            median=[median],
+            q3=[q3],
+            upperfence=[high],
+            name=f"{discount:.0%}",
+            marker_color=colors[i % len(colors)]
+        )
+        for i, (discount, (low, q1, median, q3, high)) in enumerate(stats.items())
+    ])
+    fig.update_layout(
+        title="Revenue Impact by Discount Level",
+        xaxis_title="Discount Level", 
+        yaxis_title="Revenue Impact (£)",
+        xaxis=dict(
+            tickformat='.0%',
+            tickmode='array',
+            tickvals=list(stats),
+            ticktext=[f"{x:.0%}" for x in stats]
+        ),
+        yaxis=dict(tickformat='£,.0f'),
+        showlegend=False
+    )
+    return fig
+
+@st.cache_resource(max_entries=CACHE_VERSIONS)
+def build_promo_scatter_fig(name, version, _cross_sell_data):
+    """Scatter of total revenue impact against cross-sell revenue impact"""
+    import plotly.express as px
+    
+    # Cap the markers sent to the browser, keeping the visually significant ones along the x axis
+    if len(_cross_sell_data) > MAX_SCATTER_POINTS:
+        ordered = _cross_sell_data.sort_values('total_revenue_impact')
+        keep = lttb_indices(
+            ordered['total_revenue_impact'].to_numpy(),
+            ordered['cross_sell_revenue_impact'].to_numpy(),
+            MAX_SCATTER_POINTS
+        )
+        _cross_sell_data = ordered.iloc[keep]
+    
+    fig = px.scatter(
+        _cross_sell_data,
+        x='total_revenue_impact',
+        y='cross_sell_revenue_impact',
+        size='cross_sell_items',
+        color='discount_pct',
+        hover_data=['anchor_description'],
+        title="Revenue vs Cross-sell Revenue",
+        color_continuous_scale="Viridis",
+        render_mode='webgl'
+    )
+    fig.update_layout(
+        xaxis_title="Total Revenue Impact (£)", 
+        yaxis_title="Cross-sell Revenue Impact (£)",
+        xaxis=dict(tickformat='£,.0f'),
+        yaxis=dict(tickformat='£,.0f')
+    )
+    return fig
+
+@st.cache_resource(max_entries=CACHE_VERSIONS)
+def build_promo_histogram_fig(name, version, _cross_sell_dist):
+    """Histogram of cross-sell items per scenario"""
+    import plotly.express as px
+    
+    fig = px.histogram(
+        _cross_sell_dist,
+        x='cross_sell_items',
+        nbins=20,
+        title="Cross-sell Items Distribution",
+        color_discrete_sequence=[APP_COLORS['accent1']]
+    )
+    fig.update_layout(xaxis_title="Cross-sell Items", yaxis_title="Count")
+    return fig
+
+PROMO_COLUMN_CONFIG = {
+    'anchor_description': st.column_config.TextColumn("Anchor Product"),
+    'discount_pct': st.column_config.NumberColumn("Discount", format="percent"),
+    'total_revenue_impact': st.column_config.NumberColumn("Revenue Impact", format="£%.0f"),
+    'total_margin_impact': st.column_config.NumberColumn("Margin Impact", format="£%.0f"),
+    'cross_sell_items': st.column_config.NumberColumn("Cross-sell Items"),
+}
+
+# Scenario Explorer widgets run as a fragment, so filter changes rerun only this block
+@st.fragment
+def render_scenario_explorer(plot_data, bounds, arrays):
+    """Promo scenario filters and the filtered scenarios table"""
+    # Filters
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        discount_options = bounds.discount_options
+        discount_filter = st.multiselect(
+            "Discount Levels",
+            options=discount_options,
+            default=discount_options[:3]
+        )
+    
+    # st.slider rejects an empty range, so a column with a single value (or only NaNs) gets no slider and no filter
+    with col2:
+        if bounds.revenue_range is None:
+            min_revenue_impact = 0
+        elif bounds.revenue_range[0] < bounds.revenue_range[1]:
+            revenue_min, revenue_max = bounds.revenue_range
+            min_revenue_impact = st.slider(
+                "Minimum Revenue Impact (£)", 
+                revenue_min, 
+                revenue_max,
+                revenue_min
+            )
         else:
-            data['rules'] = None
-    except Exception as e:
-        data['rules'] = None
+            min_revenue_impact = -np.inf  # nothing to filter on
     
-    try:
-        if os.path.exists('outputs/promo_scenarios_summary.csv'):
-            data['promo'] = pd.read_csv('outputs/promo_scenarios_summary.csv')
+    with col3:
+        if bounds.cross_sell_range is None:
+            min_cross_sell = 0
+        elif bounds.cross_sell_range[0] < bounds.cross_sell_range[1]:
+            cross_sell_min, cross_sell_max = bounds.cross_sell_range
+            min_cross_sell = st.slider(
+                "Minimum Cross-sell Items", 
+                cross_sell_min, 
+                cross_sell_max,
+                cross_sell_min
+            )
         else:
-            data['promo'] = None
-    except Exception as e:
-        data['promo'] = None
+            min_cross_sell = -np.inf  # nothing to filter on
     
+    # Filter data
     try:
-        if os.path.exists('outputs/data_quality_audit.csv'):
-            data['audit'] = pd.read_csv('outputs/data_quality_audit.csv')
+        mask = (arrays['total_revenue_impact'] >= min_revenue_impact) & (arrays['cross_sell_items'] >= min_cross_sell)
+        if discount_filter and len(discount_filter) > 0:
+            mask &= np.isin(arrays['discount_pct'], discount_filter)
+        filtered_promo = plot_data.iloc[np.flatnonzero(mask)]
+        display_columns = [col for col in PROMO_DISPLAY_COLUMNS if col in plot_data.columns]
+        
+        if len(filtered_promo) > PROMO_TABLE_ROWS:
+            st.markdown(f"**Showing the first {PROMO_TABLE_ROWS:,} of {len(filtered_promo):,} filtered scenarios:**")
         else:
-            data['audit'] = None
-    except Exception as e:
-        data['audit'] = None
+            st.markdown(f"**Showing {len(filtered_promo)} filtered scenarios:**")
+        st.dataframe(
+            filtered_promo[display_columns].head(PROMO_TABLE_ROWS),
+            use_container_width=True,
+            column_config=PROMO_COLUMN_CONFIG
+        )
+        # The CSV is only built when the button is clicked
+        st.download_button(
+            "Download filtered scenarios (CSV)",
+            data=lambda: filtered_promo.to_csv(index=False),
+            file_name="filtered_promo_scenarios.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
     
-    return data
+    except Exception as e:
+        st.error(f"Error filtering data: {str(e)}")
+        st.dataframe(plot_data.head(50), use_container_width=True)
+
+# Executive Summary content is static, so the page renders these ready-made HTML blocks
+EXEC_SUMMARY_PRICING_HTML = """
+<div class='info-box'>
+<h4>🎯 Pricing Strategy Insights</h4>
+<ul>
+    <li><strong>Optimal Discount Range:</strong> 5-10% discounts show positive revenue impact</li>
+    <li><strong>Elasticity Patterns:</strong> Higher discounts (20%+) may reduce overall profitability</li>
+    <li><strong>Cross-sell Leverage:</strong> Promotions drive 2-3 additional items per transaction</li>
+    <li><strong>Product Sensitivity:</strong> Top 20% of products drive 80% of promotional revenue</li>
+</ul>
+</div>
+"""
+
+EXEC_SUMMARY_CUSTOMER_HTML = """
+<div class='info-box'>
+<h4>📊 Customer Behavior Analysis</h4>
+<ul>
+    <li><strong>Basket Patterns:</strong> Average transaction contains 3.2 products</li>
+    <li><strong>Seasonal Trends:</strong> Peak shopping periods show 40% higher cross-sell rates</li>
+    <li><strong>Product Affinity:</strong> 2,118 strong product associations identified</li>
+    <li><strong>Customer Segments:</strong> High-value customers show 5x higher cross-sell potential</li>
+</ul>
+</div>
+"""
+
+EXEC_SUMMARY_REVENUE_HTML = """
+<div class='info-box'>
+<h4>📈 Revenue Optimization</h4>
+<ul>
+    <li><strong>Promotional ROI:</strong> 5% discount generates 12% revenue uplift</li>
+    <li><strong>Margin Protection:</strong> Cross-sell items maintain 35% average margin</li>
+    <li><strong>Inventory Turnover:</strong> Promoted products show 2.3x faster turnover</li>
+    <li><strong>Customer Lifetime Value:</strong> Promotional customers show 25% higher CLV</li>
+</ul>
+</div>
+"""
+
+EXEC_SUMMARY_RISK_HTML = """
+<div class='info-box'>
+<h4>🎯 Risk Mitigation</h4>
+<ul>
+    <li><strong>Data Quality:</strong> 117K+ problematic records identified and resolved</li>
+    <li><strong>Pricing Accuracy:</strong> 100% data validation for promotional decisions</li>
+    <li><strong>Inventory Risk:</strong> Top 500 products prioritized for promotional focus</li>
+    <li><strong>Customer Impact:</strong> Negative promotional scenarios filtered out</li>
+</ul>
+</div>
+"""
 
-# Load data
-data = load_data_safely()
+EXEC_SUMMARY_IMMEDIATE_HTML = """
+<div class='info-box'>
+<h4>🎯 Immediate Actions (30 Days)</h4>
+<ul>
+    <li><strong>Launch Top 3 Promotions:</strong> Focus on 5-10% discount scenarios</li>
+    <li><strong>Cross-sell Training:</strong> Train staff on identified product associations</li>
+    <li><strong>Performance Monitoring:</strong> Set up real-time promotional tracking</li>
+    <li><strong>Customer Communication:</strong> Target high-value customer segments</li>
+</ul>
+</div>
+"""
+
+EXEC_SUMMARY_LONG_TERM_HTML = """
+<div class='info-box'>
+<h4>📈 Long-term Strategy (6-12 Months)</h4>
+<ul>
+    <li><strong>Dynamic Pricing Engine:</strong> Real-time optimization based on demand</li>
+    <li><strong>Personalization Platform:</strong> Customer-specific recommendations</li>
+    <li><strong>Predictive Analytics:</strong> Forecast promotional impact and demand</li>
+    <li><strong>Competitive Intelligence:</strong> Market positioning and pricing strategy</li>
+</ul>
+</div>
+"""
+
+EXEC_SUMMARY_KPI_HTML = """
+<div class='info-box'>
+<h4>🎯 Key Performance Indicators</h4>
+<table style="width:100%; border-collapse: collapse;">
+    <tr style="background-color: #f8f9fa;">
+        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Metric</th>
+        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Current</th>
+        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Target</th>
+        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Impact</th>
+    </tr>
+    <tr>
+        <td style="border: 1px solid #ddd; padding: 8px;"><strong>Promotional ROI</strong></td>
+        <td style="border: 1px solid #ddd; padding: 8px;">12%</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">15%</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">+25% Revenue</td>
+    </tr>
+    <tr>
+        <td style="border: 1px solid #ddd; padding: 8px;"><strong>Cross-sell Rate</strong></td>
+        <td style="border: 1px solid #ddd; padding: 8px;">2.3 items</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">3.0 items</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">+30% Margin</td>
+    </tr>
+    <tr>
+        <td style="border: 1px solid #ddd; padding: 8px;"><strong>Data Quality Score</strong></td>
+        <td style="border: 1px solid #ddd; padding: 8px;">100%</td>
+        <td style="border: 1px border: 1px solid #ddd; padding: 8px;">100%</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">Reliable Decisions</td>
+    </tr>
+    <tr>
+        <td style="border: 1px solid #ddd; padding: 8px;"><strong>Customer Satisfaction</strong></td>
+        <td style="border: 1px solid #ddd; padding: 8px;">N/A</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">90%+</td>
+        <td style="border: 1px solid #ddd; padding: 8px;">Loyalty & Retention</td>
+    </tr>
+</table>
+</div>
+"""
+
+EXEC_SUMMARY_POSITIONING_HTML = """
+<div class='info-box'>
+<h4>🎯 Market Positioning</h4>
+<ul>
+    <li><strong>Data-Driven Decisions:</strong> 400K+ transactions analyzed for strategic insights</li>
+    <li><strong>Predictive Capabilities:</strong> Elasticity modeling for promotional optimization</li>
+    <li><strong>Customer Intelligence:</strong> Deep understanding of purchase patterns and preferences</li>
+    <li><strong>Operational Excellence:</strong> Automated data quality and performance monitoring</li>
+    <li><strong>Scalable Framework:</strong> Methodology applicable to other retail categories</li>
+</ul>
+</div>
+"""
+
+# (section header, blocks shown side by side)
+EXEC_SUMMARY_SECTIONS = (
+    ("<h2 class='sub-header'>💡 Key Business Insights</h2>", (EXEC_SUMMARY_PRICING_HTML, EXEC_SUMMARY_CUSTOMER_HTML)),
+    ("<h2 class='sub-header'>💰 Financial Impact Analysis</h2>", (EXEC_SUMMARY_REVENUE_HTML, EXEC_SUMMARY_RISK_HTML)),
+    ("<h2 class='sub-header'>🚀 Strategic Recommendations</h2>", (EXEC_SUMMARY_IMMEDIATE_HTML, EXEC_SUMMARY_LONG_TERM_HTML)),
+    ("<h2 class='sub-header'>📊 Success Metrics & KPIs</h2>", (EXEC_SUMMARY_KPI_HTML,)),
+    ("<h2 class='sub-header'>🏆 Competitive Advantage</h2>", (EXEC_SUMMARY_POSITIONING_HTML,)),
+)
+
+# One directory scan per rerun decides whether the cached data is still current.
+# Each page then loads only the datasets it shows, so Overview and Executive Summary read no files.
+data_version = scan_data_files()
+prune_disk_caches(data_version)
 
 # Sidebar navigation
 st.sidebar.markdown("## 🧭 Navigation")
@@ -340,26 +976,31 @@ if selected_page == "Overview":
 
 # Cleaned Data page
 elif selected_page == "Cleaned Data":
+    import plotly.graph_objects as go
+    
     st.markdown("<h1 class='main-header'>🧹 Cleaned Data Analysis</h1>", unsafe_allow_html=True)
     
-    if data['transactions'] is not None:
+    # Single streaming pass over the transactions file, cached across reruns
+    transactions = summarize_transactions(data_version)
+    
+    if transactions is not None:
         st.markdown("<h2 class='sub-header'>📊 Transaction Data Overview</h2>", unsafe_allow_html=True)
         
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Total Transactions", f"{len(data['transactions']):,}")
+            st.metric("Total Transactions", f"{transactions.rows:,}")
         with col2:
-            st.metric("Unique Products", f"{data['transactions']['StockCode'].nunique():,}")
+            st.metric("Unique Products", f"{transactions.unique_products:,}")
         with col3:
-            st.metric("Unique Customers", f"{data['transactions']['Customer ID'].nunique():,}")
+            st.metric("Unique Customers", f"{transactions.unique_customers:,}")
         with col4:
-            st.metric("Date Range", f"{data['transactions']['InvoiceDate'].min()[:10]} to {data['transactions']['InvoiceDate'].max()[:10]}")
+            st.metric("Date Range", f"{transactions.first_date} to {transactions.last_date}")
         
         # Data preview
         st.markdown("<h3 class='section-header'>📋 Data Preview</h3>", unsafe_allow_html=True)
-        st.dataframe(data['transactions'].head(100), use_container_width=True)
+        st.dataframe(transactions.preview, use_container_width=True)
         
         # Data quality metrics
         st.markdown("<h3 class='section-header'>🔍 Data Quality Metrics</h3>", unsafe_allow_html=True)
@@ -374,39 +1015,26 @@ elif selected_page == "Cleaned Data":
         
         with col1:
             # Missing values
-            missing_data = data['transactions'].isnull().sum()
-            # Convert to clean data types for Plotly
-            missing_df = pd.DataFrame({
-                'Columns': missing_data.index.astype(str),
-                'Missing_Count': missing_data.values.astype(int)
-            })
+            missing_data = transactions.missing
+            missing_counts = missing_data.values.tolist()
             
-            fig = px.bar(
-                missing_df,
-                x='Columns',
-                y='Missing_Count',
-                title="Missing Values by Column",
-                color='Missing_Count',
-                color_continuous_scale="Reds"
-            )
-            fig.update_layout(xaxis_title="Columns", yaxis_title="Missing Count")
+            fig = go.Figure(go.Bar(
+                x=missing_data.index.tolist(),
+                y=missing_counts,
+                marker=dict(color=missing_counts, colorscale="Reds", showscale=True)
+            ))
+            fig.update_layout(title="Missing Values by Column", xaxis_title="Columns", yaxis_title="Missing Count")
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Data types
-            dtype_counts = data['transactions'].dtypes.value_counts()
-            # Convert to clean data types for Plotly
-            dtype_df = pd.DataFrame({
-                'Data_Type': dtype_counts.index.astype(str),
-                'Count': dtype_counts.values.astype(int)
-            })
+            dtype_counts = transactions.dtype_counts
             
-            fig = px.pie(
-                dtype_df,
-                values='Count',
-                names='Data_Type',
-                title="Data Types Distribution"
-            )
+            fig = go.Figure(go.Pie(
+                labels=[str(dtype) for dtype in dtype_counts.index],
+                values=dtype_counts.values.tolist()
+            ))
+            fig.update_layout(title="Data Types Distribution")
             st.plotly_chart(fig, use_container_width=True)
         
         # Transaction trends
@@ -419,26 +1047,15 @@ elif selected_page == "Cleaned Data":
         """, unsafe_allow_html=True)
         
         try:
-            # Convert InvoiceDate to datetime if it's not already
-            if data['transactions']['InvoiceDate'].dtype == 'object':
-                data['transactions']['InvoiceDate'] = pd.to_datetime(data['transactions']['InvoiceDate'])
-            
-            # Daily transaction count - ensure data types are clean
-            daily_transactions = data['transactions'].groupby(data['transactions']['InvoiceDate'].dt.date).size().reset_index()
-            daily_transactions.columns = ['Date', 'Transaction_Count']
-            
-            # Convert to clean data types for Plotly
-            daily_transactions['Date'] = daily_transactions['Date'].astype(str)
-            daily_transactions['Transaction_Count'] = daily_transactions['Transaction_Count'].astype(int)
+            # Downsample long series so the browser only draws the visually significant points
+            keep = lttb_indices(transactions.day_numbers, transactions.day_counts, MAX_LINE_POINTS)
             
-            fig = px.line(
-                daily_transactions,
-                x='Date',
-                y='Transaction_Count',
-                title="Daily Transaction Volume",
-                markers=True
-            )
-            fig.update_layout(xaxis_title="Date", yaxis_title="Number of Transactions")
+            fig = go.Figure(go.Scatter(
+                x=transactions.day_numbers[keep].astype('datetime64[D]').astype(str).tolist(),
+                y=transactions.day_counts[keep].tolist(),
+                mode='lines+markers'
+            ))
+            fig.update_layout(title="Daily Transaction Volume", xaxis_title="Date", yaxis_title="Number of Transactions")
             st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating transaction trends chart: {str(e)}")
@@ -456,6 +1073,8 @@ elif selected_page == "Cleaned Data":
 elif selected_page == "Top Products":
     st.markdown("<h1 class='main-header'>🏆 Top Products Analysis</h1>", unsafe_allow_html=True)
     
+    data = load_data_safely(data_version, ('baseline',))
+    
     if data['baseline'] is not None:
         st.markdown("<h2 class='sub-header'>📊 Product Performance Metrics</h2>", unsafe_allow_html=True)
         
@@ -467,20 +1086,15 @@ elif selected_page == "Top Products":
         </div>
         """, unsafe_allow_html=True)
         
-        top_products = data['baseline'].nlargest(20, 'revenue')
+        top_products = data['baseline'].head(20)
         
         # Fix: Use 'Description' instead of 'description' and handle data types safely
         try:
-            fig = px.bar(
-                top_products,
-                x='revenue',
-                y='Description',
-                orientation='h',
-                title="Top 20 Products by Revenue",
-                color='revenue',
-                color_continuous_scale="Blues"
+            fig = build_top_bar_fig(
+                'baseline', data_version, top_products, 'revenue', 'Description',
+                "Top 20 Products by Revenue", "Blues",
+                "Revenue ($)", "Product Description"
             )
-            fig.update_layout(xaxis_title="Revenue ($)", yaxis_title="Product Description")
             st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating chart: {str(e)}")
@@ -502,28 +1116,20 @@ elif selected_page == "Top Products":
         
         with col1:
             try:
-                fig = px.histogram(
-                    data['baseline'],
-                    x='revenue',
-                    nbins=30,
-                    title="Revenue Distribution",
-                    color_discrete_sequence=[APP_COLORS['primary']]
+                fig = build_histogram_fig(
+                    'baseline', data_version, data['baseline'], 'revenue', "Revenue Distribution",
+                    APP_COLORS['primary'], "Revenue ($)"
                 )
-                fig.update_layout(xaxis_title="Revenue ($)", yaxis_title="Count")
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating revenue histogram: {str(e)}")
         
         with col2:
             try:
-                fig = px.histogram(
-                    data['baseline'],
-                    x='avg_price',
-                    nbins=30,
-                    title="Average Price Distribution",
-                    color_discrete_sequence=[APP_COLORS['secondary']]
+                fig = build_histogram_fig(
+                    'baseline', data_version, data['baseline'], 'avg_price', "Average Price Distribution",
+                    APP_COLORS['secondary'], "Average Price ($)"
                 )
-                fig.update_layout(xaxis_title="Average Price ($)", yaxis_title="Count")
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating price histogram: {str(e)}")
@@ -556,14 +1162,13 @@ elif selected_page == "Top Products":
         
         # Filter data
         try:
-            filtered_baseline = data['baseline'][
-                (data['baseline']['revenue'] >= min_revenue) & 
-                (data['baseline']['avg_price'] >= min_price)
-            ]
+            arrays = column_arrays('baseline', data_version, data['baseline'], ('revenue', 'avg_price'))
+            mask = (arrays['revenue'] >= min_revenue) & (arrays['avg_price'] >= min_price)
+            filtered_baseline = data['baseline'].iloc[np.flatnonzero(mask)]
             st.dataframe(filtered_baseline, use_container_width=True)
         except Exception as e:
             st.error(f"Error filtering data: {str(e)}")
-            st.dataframe(data['baseline'].head(50), use_container_width=True)
+            st.dataframe(data['baseline_preview'], use_container_width=True)
         
     else:
         st.markdown("""
@@ -577,9 +1182,17 @@ elif selected_page == "Top Products":
 elif selected_page == "Association Rules":
     st.markdown("<h1 class='main-header'>🔗 Association Rules Analysis</h1>", unsafe_allow_html=True)
     
+    data = load_data_safely(data_version, ('rules',))
+    
     if data['rules'] is not None:
         st.markdown("<h2 class='sub-header'>📊 Market Basket Analysis Results</h2>", unsafe_allow_html=True)
         
+        # Summary statistics are computed once and cached across reruns
+        try:
+            summary = rules_summary('rules', data_version, data['rules'])
+        except Exception as e:
+            summary = None
+        
         # Key metrics
         col1, col2, col3, col4 = st.columns(4)
         
@@ -587,17 +1200,17 @@ elif selected_page == "Association Rules":
             st.metric("Total Rules", f"{len(data['rules']):,}")
         with col2:
             try:
-                st.metric("Avg Support", f"{data['rules']['support'].mean():.4f}")
+                st.metric("Avg Support", f"{summary.avg_support:.4f}")
             except:
                 st.metric("Avg Support", "N/A")
         with col3:
             try:
-                st.metric("Avg Confidence", f"{data['rules']['confidence'].mean():.4f}")
+                st.metric("Avg Confidence", f"{summary.avg_confidence:.4f}")
             except:
                 st.metric("Avg Confidence", "N/A")
         with col4:
             try:
-                st.metric("Avg Lift", f"{data['rules']['lift'].mean():.2f}")
+                st.metric("Avg Lift", f"{summary.avg_lift:.2f}")
             except:
                 st.metric("Avg Lift", "N/A")
         
@@ -612,18 +1225,13 @@ elif selected_page == "Association Rules":
         """, unsafe_allow_html=True)
         
         try:
-            top_rules = data['rules'].nlargest(20, 'lift')
+            top_rules = summary.top20
             
-            fig = px.bar(
-                top_rules,
-                x='lift',
-                y='antecedent',
-                orientation='h',
-                title="Top 20 Rules by Lift",
-                color='lift',
-                color_continuous_scale="Greens"
+            fig = build_top_bar_fig(
+                'rules', data_version, top_rules, 'lift', 'antecedent',
+                "Top 20 Rules by Lift", "Greens",
+                "Lift", "Antecedent → Consequent"
             )
-            fig.update_layout(xaxis_title="Lift", yaxis_title="Antecedent → Consequent")
             st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating lift chart: {str(e)}")
@@ -640,17 +1248,7 @@ elif selected_page == "Association Rules":
         """, unsafe_allow_html=True)
         
         try:
-            fig = px.scatter(
-                data['rules'],
-                x='support',
-                y='confidence',
-                size='lift',
-                color='lift',
-                hover_data=['antecedent', 'consequent'],
-                title="Support vs Confidence (Size = Lift)",
-                color_continuous_scale="Viridis"
-            )
-            fig.update_layout(xaxis_title="Support", yaxis_title="Confidence")
+            fig = build_rules_scatter_fig('rules', data_version, data['rules'])
             st.plotly_chart(fig, use_container_width=True)
         except Exception as e:
             st.error(f"Error creating scatter plot: {str(e)}")
@@ -669,28 +1267,20 @@ elif selected_page == "Association Rules":
         
         with col1:
             try:
-                fig = px.histogram(
-                    data['rules'],
-                    x='support',
-                    nbins=30,
-                    title="Support Distribution",
-                    color_discrete_sequence=[APP_COLORS['primary']]
+                fig = build_histogram_fig(
+                    'rules', data_version, data['rules'], 'support', "Support Distribution",
+                    APP_COLORS['primary'], "Support"
                 )
-                fig.update_layout(xaxis_title="Support", yaxis_title="Count")
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating support histogram: {str(e)}")
         
         with col2:
             try:
-                fig = px.histogram(
-                    data['rules'],
-                    x='confidence',
-                    nbins=30,
-                    title="Confidence Distribution",
-                    color_discrete_sequence=[APP_COLORS['secondary']]
+                fig = build_histogram_fig(
+                    'rules', data_version, data['rules'], 'confidence', "Confidence Distribution",
+                    APP_COLORS['secondary'], "Confidence"
                 )
-                fig.update_layout(xaxis_title="Confidence", yaxis_title="Count")
                 st.plotly_chart(fig, use_container_width=True)
             except Exception as e:
                 st.error(f"Error creating confidence histogram: {str(e)}")
@@ -730,15 +1320,17 @@ elif selected_page == "Association Rules":
         
         # Filter data
         try:
-            filtered_rules = data['rules'][
-                (data['rules']['support'] >= min_support) & 
-                (data['rules']['confidence'] >= min_confidence) &
-                (data['rules']['lift'] >= min_lift)
-            ]
+            arrays = column_arrays('rules', data_version, data['rules'], ('support', 'confidence', 'lift'))
+            mask = (
+                (arrays['support'] >= min_support) &
+                (arrays['confidence'] >= min_confidence) &
+                (arrays['lift'] >= min_lift)
+            )
+            filtered_rules = data['rules'].iloc[np.flatnonzero(mask)]
             st.dataframe(filtered_rules, use_container_width=True)
         except Exception as e:
             st.error(f"Error filtering rules: {str(e)}")
-            st.dataframe(data['rules'].head(50), use_container_width=True)
+            st.dataframe(data['rules_preview'], use_container_width=True)
         
     else:
         st.markdown("""
@@ -752,6 +1344,10 @@ elif selected_page == "Association Rules":
 elif selected_page == "Promo Scenarios":
     st.markdown("<h1 class='main-header'>🎯 Promotional Scenarios Analysis</h1>", unsafe_allow_html=True)
     
+    data = load_data_safely(data_version, ('promo',))
+    # Column names looked up once; plot_data keeps the same columns, so the checks below share this set
+    promo_cols = frozenset(data['promo'].columns) if data['promo'] is not None else frozenset()
+    
     if data['promo'] is not None:
         st.markdown("<h2 class='sub-header'>💰 Promotional Impact Analysis</h2>", unsafe_allow_html=True)
         
@@ -761,33 +1357,23 @@ elif selected_page == "Promo Scenarios":
         with col1:
             st.metric("Total Scenarios", f"{len(data['promo']):,}")
         with col2:
-            try:
-                # Map to actual column names
-                if 'total_revenue_impact' in data['promo'].columns:
-                    avg_revenue_impact = data['promo']['total_revenue_impact'].mean()
-                    st.metric("Avg Revenue Impact", f"£{avg_revenue_impact:,.0f}")
-                else:
-                    st.metric("Avg Revenue Impact", "N/A")
-            except Exception as e:
-                st.metric("Avg Revenue Impact", "Error")
+            if numeric_promo_column(data['promo'], promo_cols, 'total_revenue_impact'):
+                avg_revenue_impact = data['promo']['total_revenue_impact'].mean()
+                st.metric("Avg Revenue Impact", f"£{avg_revenue_impact:,.0f}")
+            else:
+                st.metric("Avg Revenue Impact", "N/A")
         with col3:
-            try:
-                if 'total_margin_impact' in data['promo'].columns:
-                    avg_margin_impact = data['promo']['total_margin_impact'].mean()
-                    st.metric("Avg Margin Impact", f"£{avg_margin_impact:,.0f}")
-                else:
-                    st.metric("Avg Margin Impact", "N/A")
-            except Exception as e:
-                st.metric("Avg Margin Impact", "Error")
+            if numeric_promo_column(data['promo'], promo_cols, 'total_margin_impact'):
+                avg_margin_impact = data['promo']['total_margin_impact'].mean()
+                st.metric("Avg Margin Impact", f"£{avg_margin_impact:,.0f}")
+            else:
+                st.metric("Avg Margin Impact", "N/A")
         with col4:
-            try:
-                if 'cross_sell_items' in data['promo'].columns:
-                    avg_cross_sell = data['promo']['cross_sell_items'].mean()
-                    st.metric("Avg Cross-sell Items", f"{avg_cross_sell:.1f}")
-                else:
-                    st.metric("Avg Cross-sell Items", "N/A")
-            except Exception as e:
-                st.metric("Avg Cross-sell Items", "Error")
+            if numeric_promo_column(data['promo'], promo_cols, 'cross_sell_items'):
+                avg_cross_sell = data['promo']['cross_sell_items'].mean()
+                st.metric("Avg Cross-sell Items", f"{avg_cross_sell:.1f}")
+            else:
+                st.metric("Avg Cross-sell Items", "N/A")
         
         # Summary statistics
         st.markdown("<h3 class='section-header'>📊 Promotional Performance Summary</h3>", unsafe_allow_html=True)
@@ -804,11 +1390,7 @@ elif selected_page == "Promo Scenarios":
         with col1:
             try:
                 # Discount level analysis
-                discount_summary = data['promo'].groupby('discount_pct').agg({
-                    'total_revenue_impact': 'mean',
-                    'total_margin_impact': 'mean',
-                    'cross_sell_items': 'mean'
-                }).round(2)
+                discount_summary = promo_discount_summary('promo', data_version, data['promo'])
                 
                 st.markdown("**Performance by Discount Level:**")
                 st.dataframe(discount_summary, use_container_width=True)
@@ -818,7 +1400,7 @@ elif selected_page == "Promo Scenarios":
         with col2:
             try:
                 # Top performing scenarios
-                top_scenarios = data['promo'].nlargest(5, 'total_revenue_impact')[['anchor_description', 'discount_pct', 'total_revenue_impact', 'total_margin_impact']]
+                top_scenarios = promo_top_scenarios('promo', data_version, data['promo'])
                 st.markdown("**Top 5 Revenue Impact Scenarios:**")
                 st.dataframe(top_scenarios, use_container_width=True)
             except Exception as e:
@@ -829,46 +1411,20 @@ elif selected_page == "Promo Scenarios":
         st.markdown("""
         <div class='info-box'>
         <p><strong>What this chart shows:</strong> This box plot displays how different discount levels affect revenue. Each box shows the distribution of revenue impact 
-        for a specific discount percentage. The box represents the middle 50% of results, the line inside is the median, and dots show individual scenarios. 
-        Higher boxes indicate better revenue performance.</p>
+        for a specific discount percentage. The box represents the middle 50% of results, the line inside is the median, and the whiskers reach the lowest and highest scenario. 
+        Individual scenarios are not plotted. Higher boxes indicate better revenue performance.</p>
         </div>
         """, unsafe_allow_html=True)
         
+        # Stays None if the promo data can't be prepared, so the sections below can skip their charts
+        plot_data = None
         try:
             # Clean data for plotting
-            plot_data = data['promo'].copy()
-            
-            # Convert to numeric and handle any non-numeric values
-            for col in ['total_revenue_impact', 'total_margin_impact', 'discount_pct']:
-                if col in plot_data.columns:
-                    plot_data[col] = pd.to_numeric(plot_data[col], errors='coerce')
-            
-            # Remove any rows with NaN values for plotting
-            plot_data = plot_data.dropna(subset=['total_revenue_impact', 'discount_pct'])
+            plot_data = promo_plot_data('promo', data_version, data['promo'])
             
             if len(plot_data) > 0:
-                # Create a more readable chart with better formatting
-                fig = px.box(
-                    plot_data,
-                    x='discount_pct',
-                    y='total_revenue_impact',
-                    title="Revenue Impact by Discount Level",
-                    color='discount_pct',
-                    color_discrete_sequence=px.colors.qualitative.Set3
-                )
-                fig.update_layout(
-                    xaxis_title="Discount Level", 
-                    yaxis_title="Revenue Impact (£)",
-                    xaxis=dict(
-                        tickformat='.0%',
-                        tickmode='array',
-                        tickvals=sorted(plot_data['discount_pct'].unique()),
-                        ticktext=[f"{x:.0%}" for x in sorted(plot_data['discount_pct'].unique())]
-                    ),
-                    yaxis=dict(tickformat='£,.0f'),
-                    showlegend=False
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                fig = build_promo_box_fig('promo', data_version, plot_data)
+                st.plotly_chart(fig, use_container_width=True, key="promo_box")
             else:
                 st.warning("No valid data available for plotting. Check data types and missing values.")
                 
@@ -877,136 +1433,66 @@ elif selected_page == "Promo Scenarios":
             st.write("Debug info - Data types:")
             st.write(data['promo'].dtypes)
         
-        # Cross-sell analysis
-        st.markdown("<h3 class='section-header'>🔄 Cross-sell Impact Analysis</h3>", unsafe_allow_html=True)
-        st.markdown("""
-        <div class='info-box'>
-        <p><strong>What these charts show:</strong> The left chart (scatter plot) shows the relationship between total revenue impact and cross-sell revenue. 
-        Each point represents a promotional scenario, with size indicating the number of cross-sell items. The right chart (histogram) shows the distribution 
-        of how many additional items customers buy when promotions are offered.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            try:
-                if 'cross_sell_revenue_impact' in plot_data.columns and 'total_revenue_impact' in plot_data.columns:
-                    # Clean cross-sell data
-                    cross_sell_data = plot_data.dropna(subset=['cross_sell_revenue_impact', 'total_revenue_impact'])
-                    
-                    if len(cross_sell_data) > 0:
-                        fig = px.scatter(
-                            cross_sell_data,
-                            x='total_revenue_impact',
-                            y='cross_sell_revenue_impact',
-                            size='cross_sell_items',
-                            color='discount_pct',
-                            hover_data=['anchor_description'],
-                            title="Revenue vs Cross-sell Revenue",
-                            color_continuous_scale="Viridis"
-                        )
-                        fig.update_layout(
-                            xaxis_title="Total Revenue Impact (£)", 
-                            yaxis_title="Cross-sell Revenue Impact (£)",
-                            xaxis=dict(tickformat='£,.0f'),
-                            yaxis=dict(tickformat='£,.0f')
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                    else:
-                        st.warning("No valid cross-sell data available for plotting.")
-                else:
-                    st.warning("Cross-sell columns not found in data.")
-            except Exception as e:
-                st.error(f"Error creating cross-sell scatter plot: {str(e)}")
-        
-        with col2:
-            try:
-                if 'cross_sell_items' in plot_data.columns:
-                    cross_sell_dist = plot_data.dropna(subset=['cross_sell_items'])
-                    
-                    if len(cross_sell_dist) > 0:
-                        fig = px.histogram(
-                            cross_sell_dist,
-                            x='cross_sell_items',
-                            nbins=20,
-                            title="Cross-sell Items Distribution",
-                            color_discrete_sequence=[APP_COLORS['accent1']]
-                        )
-                        fig.update_layout(xaxis_title="Cross-sell Items", yaxis_title="Count")
-                        st.plotly_chart(fig, use_container_width=True)
-                    else:
-                        st.warning("No valid cross-sell items data available.")
-                else:
-                    st.warning("Cross-sell items column not found.")
-            except Exception as e:
-                st.error(f"Error creating cross-sell histogram: {str(e)}")
+        # Cross-sell analysis - collapsed sections track their open state, so their charts are only built once expanded
+        cross_sell_section = st.expander("🔄 Cross-sell Impact Analysis", expanded=False, key="promo_cross_sell_open", on_change="rerun")
+        with cross_sell_section:
+            if cross_sell_section.open and plot_data is None:
+                st.warning("Cross-sell charts are unavailable because the promo data could not be prepared for plotting.")
+            elif cross_sell_section.open:
+                st.markdown("""
+                <div class='info-box'>
+                <p><strong>What these charts show:</strong> The left chart (scatter plot) shows the relationship between total revenue impact and cross-sell revenue. 
+                Each point represents a promotional scenario, with size indicating the number of cross-sell items. The right chart (histogram) shows the distribution 
+                of how many additional items customers buy when promotions are offered.</p>
+                </div>
+                """, unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    try:
+                        if 'cross_sell_revenue_impact' in promo_cols and 'total_revenue_impact' in promo_cols:
+                            # Clean cross-sell data
+                            cross_sell_data = plot_data.dropna(subset=['cross_sell_revenue_impact', 'total_revenue_impact'])
+                            
+                            if len(cross_sell_data) > 0:
+                                fig = build_promo_scatter_fig('promo', data_version, cross_sell_data)
+                                st.plotly_chart(fig, use_container_width=True, key="promo_scatter")
+                            else:
+                                st.warning("No valid cross-sell data available for plotting.")
+                        else:
+                            st.warning("Cross-sell columns not found in data.")
+                    except Exception as e:
+                        st.error(f"Error creating cross-sell scatter plot: {str(e)}")
+                
+                with col2:
+                    try:
+                        if 'cross_sell_items' in promo_cols:
+                            cross_sell_dist = plot_data.dropna(subset=['cross_sell_items'])
+                            
+                            if len(cross_sell_dist) > 0:
+                                fig = build_promo_histogram_fig('promo', data_version, cross_sell_dist)
+                                st.plotly_chart(fig, use_container_width=True, key="promo_hist")
+                            else:
+                                st.warning("No valid cross-sell items data available.")
+                        else:
+                            st.warning("Cross-sell items column not found.")
+                    except Exception as e:
+                        st.error(f"Error creating cross-sell histogram: {str(e)}")
         
         # Interactive scenario explorer
-        st.markdown("<h3 class='section-header'>🔍 Scenario Explorer</h3>", unsafe_allow_html=True)
-        
-        # Filters
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            try:
-                discount_options = sorted(plot_data['discount_pct'].dropna().unique())
-                discount_filter = st.multiselect(
-                    "Discount Levels",
-                    options=discount_options,
-                    default=discount_options[:3] if len(discount_options) >= 3 else discount_options
-                )
-            except:
-                discount_filter = []
-        
-        with col2:
-            try:
-                if 'total_revenue_impact' in plot_data.columns:
-                    min_revenue_impact = st.slider(
-                        "Minimum Revenue Impact (£)", 
-                        float(plot_data['total_revenue_impact'].min()), 
-                        float(plot_data['total_revenue_impact'].max()),
-                        float(plot_data['total_revenue_impact'].min())
+        explorer_section = st.expander("🔍 Scenario Explorer", expanded=False, key="promo_explorer_open", on_change="rerun")
+        with explorer_section:
+            if explorer_section.open and plot_data is None:
+                st.warning("Scenario Explorer is unavailable because the promo data could not be prepared for plotting.")
+            elif explorer_section.open:
+                try:
+                    explorer_arrays = column_arrays(
+                        'promo_plot', data_version, plot_data, ('discount_pct', 'total_revenue_impact', 'cross_sell_items')
                     )
-                else:
-                    min_revenue_impact = 0
-            except:
-                min_revenue_impact = 0
-        
-        with col3:
-            try:
-                if 'cross_sell_items' in plot_data.columns:
-                    min_cross_sell = st.slider(
-                        "Minimum Cross-sell Items", 
-                        float(plot_data['cross_sell_items'].min()), 
-                        float(plot_data['cross_sell_items'].max()),
-                        float(plot_data['cross_sell_items'].min())
-                    )
-                else:
-                    min_cross_sell = 0
-            except:
-                min_cross_sell = 0
-        
-        # Filter data
-        try:
-            if discount_filter and len(discount_filter) > 0:
-                filtered_promo = plot_data[
-                    (plot_data['discount_pct'].isin(discount_filter)) &
-                    (plot_data['total_revenue_impact'] >= min_revenue_impact) &
-                    (plot_data['cross_sell_items'] >= min_cross_sell)
-                ]
-            else:
-                filtered_promo = plot_data[
-                    (plot_data['total_revenue_impact'] >= min_revenue_impact) &
-                    (plot_data['cross_sell_items'] >= min_cross_sell)
-                ]
-            
-            st.markdown(f"**Showing {len(filtered_promo)} filtered scenarios:**")
-            st.dataframe(filtered_promo, use_container_width=True)
-            
-        except Exception as e:
-            st.error(f"Error filtering data: {str(e)}")
-            st.dataframe(plot_data.head(50), use_container_width=True)
+                except Exception as e:
+                    explorer_arrays = None
+                render_scenario_explorer(plot_data, promo_filter_bounds('promo', data_version, plot_data), explorer_arrays)
         
     else:
         st.markdown("""
@@ -1020,155 +1506,15 @@ elif selected_page == "Promo Scenarios":
 elif selected_page == "Executive Summary":
     st.markdown("<h1 class='main-header'>📊 Executive Summary</h1>", unsafe_allow_html=True)
     
-    # Key Business Insights
-    st.markdown("<h2 class='sub-header'>💡 Key Business Insights</h2>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div class='info-box'>
-        <h4>🎯 Pricing Strategy Insights</h4>
-        <ul>
-            <li><strong>Optimal Discount Range:</strong> 5-10% discounts show positive revenue impact</li>
-            <li><strong>Elasticity Patterns:</strong> Higher discounts (20%+) may reduce overall profitability</li>
-            <li><strong>Cross-sell Leverage:</strong> Promotions drive 2-3 additional items per transaction</li>
-            <li><strong>Product Sensitivity:</strong> Top 20% of products drive 80% of promotional revenue</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class='info-box'>
-        <h4>📊 Customer Behavior Analysis</h4>
-        <ul>
-            <li><strong>Basket Patterns:</strong> Average transaction contains 3.2 products</li>
-            <li><strong>Seasonal Trends:</strong> Peak shopping periods show 40% higher cross-sell rates</li>
-            <li><strong>Product Affinity:</strong> 2,118 strong product associations identified</li>
-            <li><strong>Customer Segments:</strong> High-value customers show 5x higher cross-sell potential</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Financial Impact Analysis
-    st.markdown("<h2 class='sub-header'>💰 Financial Impact Analysis</h2>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div class='info-box'>
-        <h4>📈 Revenue Optimization</h4>
-        <ul>
-            <li><strong>Promotional ROI:</strong> 5% discount generates 12% revenue uplift</li>
-            <li><strong>Margin Protection:</strong> Cross-sell items maintain 35% average margin</li>
-            <li><strong>Inventory Turnover:</strong> Promoted products show 2.3x faster turnover</li>
-            <li><strong>Customer Lifetime Value:</strong> Promotional customers show 25% higher CLV</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class='info-box'>
-        <h4>🎯 Risk Mitigation</h4>
-        <ul>
-            <li><strong>Data Quality:</strong> 117K+ problematic records identified and resolved</li>
-            <li><strong>Pricing Accuracy:</strong> 100% data validation for promotional decisions</li>
-            <li><strong>Inventory Risk:</strong> Top 500 products prioritized for promotional focus</li>
-            <li><strong>Customer Impact:</strong> Negative promotional scenarios filtered out</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Strategic Recommendations
-    st.markdown("<h2 class='sub-header'>🚀 Strategic Recommendations</h2>", unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        <div class='info-box'>
-        <h4>🎯 Immediate Actions (30 Days)</h4>
-        <ul>
-            <li><strong>Launch Top 3 Promotions:</strong> Focus on 5-10% discount scenarios</li>
-            <li><strong>Cross-sell Training:</strong> Train staff on identified product associations</li>
-            <li><strong>Performance Monitoring:</strong> Set up real-time promotional tracking</li>
-            <li><strong>Customer Communication:</strong> Target high-value customer segments</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class='info-box'>
-        <h4>📈 Long-term Strategy (6-12 Months)</h4>
-        <ul>
-            <li><strong>Dynamic Pricing Engine:</strong> Real-time optimization based on demand</li>
-            <li><strong>Personalization Platform:</strong> Customer-specific recommendations</li>
-            <li><strong>Predictive Analytics:</strong> Forecast promotional impact and demand</li>
-            <li><strong>Competitive Intelligence:</strong> Market positioning and pricing strategy</li>
-        </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Success Metrics & KPIs
-    st.markdown("<h2 class='sub-header'>📊 Success Metrics & KPIs</h2>", unsafe_allow_html=True)
-    
-    st.markdown("""
-    <div class='info-box'>
-    <h4>🎯 Key Performance Indicators</h4>
-    <table style="width:100%; border-collapse: collapse;">
-        <tr style="background-color: #f8f9fa;">
-            <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Metric</th>
-            <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Current</th>
-            <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Target</th>
-            <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Impact</th>
-        </tr>
-        <tr>
-            <td style="border: 1px solid #ddd; padding: 8px;"><strong>Promotional ROI</strong></td>
-            <td style="border: 1px solid #ddd; padding: 8px;">12%</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">15%</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">+25% Revenue</td>
-        </tr>
-        <tr>
-            <td style="border: 1px solid #ddd; padding: 8px;"><strong>Cross-sell Rate</strong></td>
-            <td style="border: 1px solid #ddd; padding: 8px;">2.3 items</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">3.0 items</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">+30% Margin</td>
-        </tr>
-        <tr>
-            <td style="border: 1px solid #ddd; padding: 8px;"><strong>Data Quality Score</strong></td>
-            <td style="border: 1px solid #ddd; padding: 8px;">100%</td>
-            <td style="border: 1px border: 1px solid #ddd; padding: 8px;">100%</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">Reliable Decisions</td>
-        </tr>
-        <tr>
-            <td style="border: 1px solid #ddd; padding: 8px;"><strong>Customer Satisfaction</strong></td>
-            <td style="border: 1px solid #ddd; padding: 8px;">N/A</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">90%+</td>
-            <td style="border: 1px solid #ddd; padding: 8px;">Loyalty & Retention</td>
-        </tr>
-    </table>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Competitive Advantage
-    st.markdown("<h2 class='sub-header'>🏆 Competitive Advantage</h2>", unsafe_allow_html=True)
-    
-    st.markdown("""
-    <div class='info-box'>
-    <h4>🎯 Market Positioning</h4>
-    <ul>
-        <li><strong>Data-Driven Decisions:</strong> 400K+ transactions analyzed for strategic insights</li>
-        <li><strong>Predictive Capabilities:</strong> Elasticity modeling for promotional optimization</li>
-        <li><strong>Customer Intelligence:</strong> Deep understanding of purchase patterns and preferences</li>
-        <li><strong>Operational Excellence:</strong> Automated data quality and performance monitoring</li>
-        <li><strong>Scalable Framework:</strong> Methodology applicable to other retail categories</li>
-    </ul>
-    </div>
-    """, unsafe_allow_html=True)
+    for header, blocks in EXEC_SUMMARY_SECTIONS:
+        st.markdown(header, unsafe_allow_html=True)
+        
+        if len(blocks) == 1:
+            st.markdown(blocks[0], unsafe_allow_html=True)
+        else:
+            for col, html in zip(st.columns(len(blocks)), blocks):
+                with col:
+                    st.markdown(html, unsafe_allow_html=True)
 
 # Footer
 st.markdown("<div class='footer'>🛒 2025 Retail Pricing Market Basket Analysis Project | Created by Ali Hasan</div>", unsafe_allow_html=True)